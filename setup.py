@@ -24,18 +24,23 @@ Ublox Reader app entry point
 """
 
 from os import path
-from setuptools import setup, find_packages, Command
+from setuptools import setup, Command
 import subprocess
 
 # --------------------------------------------------------------------------------------------
 
-this_directory = path.abspath(path.dirname(__file__))
-with open(path.join(this_directory, 'README.md'), encoding='utf-8') as f:
-    long_description = f.read()
-
 VERSION = "1.0.0"
 
 
+def read_long_description():
+    """
+    Read the README only when the metadata is actually built
+    """
+    this_directory = path.abspath(path.dirname(__file__))
+    with open(path.join(this_directory, 'README.md'), encoding='utf-8') as f:
+        return f.read()
+
+
 # --------------------------------------------------------------------------------------------
 
 
@@ -72,14 +77,13 @@ setup(
     license="Apache Software License (Apache Software License 2.0)",
     description="Package that handles a ublox receiver",
     url="",
-    long_description=long_description,
+    long_description=read_long_description(),
     long_description_content_type="text/markdown",
     python_requires=">=3.7",
-    packages=find_packages(include=['ublox_reader', 'ublox_reader.*']),
+    packages=['ublox_reader', 'ublox_reader.database', 'ublox_reader.serial'],
     install_requires=[
         'aioserial>=1.3.0',
         'asyncpg>=0.23.0',
-        'bitarray>=2.0.1',
         'uvloop>=0.15.0',
         'numpy>=1.20.3'
     ],
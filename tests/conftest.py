@@ -0,0 +1,63 @@
+"""
+Shared fixtures for the test suite
+
+:author: Angelo Cutaia
+:copyright: Copyright 2021, LINKS Foundation
+:version: 1.0.0
+
+..
+
+    Copyright 2021 LINKS Foundation
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        https://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+
+# Standard library
+import asyncio
+
+# Test
+import pytest
+
+# Asynchronous library
+import uvloop
+
+# Dummy database
+from tests.ublox_reader.database.dummy import close_admin_connection
+
+# Substitute asyncio loop with uvloop for the whole test session
+uvloop.install()
+
+# ------------------------------------------------------------------------------
+
+
+# Module version
+__version_info__ = (1, 0, 0)
+__version__ = ".".join(str(x) for x in __version_info__)
+
+# Documentation strings format
+__docformat__ = "restructuredtext en"
+
+
+# ------------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """
+    Reuse a single uvloop event loop for the whole test session
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    # Close the keep-alive admin connection of the database tests
+    loop.run_until_complete(close_admin_connection())
+    loop.close()
@@ -26,7 +26,10 @@ Test constants
 import os
 import time
 
-FAKE_DATA = os.path.join(os.path.abspath(os.path.dirname(__file__)), "fake_data.txt")
+HERE = os.path.abspath(os.path.dirname(__file__))
+"""Directory containing the tests, computed only once"""
+
+FAKE_DATA = os.path.join(HERE, "fake_data.txt")
 """Path of the file containing the fake data"""
 
 # ------------------------------------------------------------------------------
@@ -46,35 +49,8 @@ __docformat__ = "restructuredtext en"
 ########
 
 
-TIME_MESSAGE_PAYLOAD = bytes(
-    [
-        0x1,
-        0x25,
-        0x14,
-        0x0,
-        0x0,
-        0x16,
-        0x9C,
-        0x16,
-        0xC0,
-        0xC9,
-        0x5,
-        0x0,
-        0x1C,
-        0xA4,
-        0x2,
-        0x0,
-        0x31,
-        0x4,
-        0x12,
-        0x7,
-        0x3,
-        0x0,
-        0x0,
-        0x0,
-        0xA3,
-        0xEF,
-    ]
+TIME_MESSAGE_PAYLOAD = bytes.fromhex(
+    "0125140000169c16c0c905001ca402003104120703000000a3ef"
 )
 """Time message payload with"""
 
@@ -107,66 +83,16 @@ time_raw_ck_B = 239
 ###########
 
 
-UBLOX_MESSAGE_PAYLOAD = bytes(
-    [
-        0x2,
-        0x13,
-        0x2C,
-        0x0,
-        0x2,
-        0x12,
-        0x1,
-        0x0,
-        0x9,
-        0xE,
-        0x2,
-        0xD2,
-        0x34,
-        0x77,
-        0x76,
-        0x7,
-        0x5D,
-        0x63,
-        0x0,
-        0x1,
-        0xF5,
-        0x51,
-        0x22,
-        0x24,
-        0x0,
-        0x40,
-        0xF,
-        0x7F,
-        0x0,
-        0x40,
-        0x65,
-        0xA6,
-        0x2A,
-        0x0,
-        0x0,
-        0x0,
-        0xD2,
-        0x57,
-        0xAA,
-        0xAA,
-        0x0,
-        0x40,
-        0xBF,
-        0x3F,
-        0xD5,
-        0x9A,
-        0xE8,
-        0x3F,
-        0x4A,
-        0x7C,
-    ]
+UBLOX_MESSAGE_PAYLOAD = bytes.fromhex(
+    "02132c0002120100090e02d2347776075d630001f551222400400f7f"
+    "004065a62a000000d257aaaa0040bf3fd59ae83f4a7c"
 )
 """Ublox message payload"""
 
 GALILEO_MESSAGE_PAYLOAD = "077677340100635d242251f57f0f40a66540000000002aaaaa57d23fbf40"
 """Galileo message payload"""
 
-TEST_AUTH_BYTES = bytes([0x0, 0x40, 0x65, 0xA6, 0x2A, 0x0, 0x0, 0x0])
+TEST_AUTH_BYTES = bytes.fromhex("004065a62a000000")
 """Bytes that contain inside the 40 auth bits"""
 
 raw_auth = 0
@@ -192,22 +118,32 @@ raw_ck_B = 124
 #################
 
 
-DATA_TO_STORE = (
-    time.time() * 1000,
-    timestampMessage_unix,
-    raw_galTow,
-    raw_galWno,
-    raw_leapS,
-    UBLOX_MESSAGE_PAYLOAD.hex(),
-    GALILEO_MESSAGE_PAYLOAD,
-    0,
-    raw_svId,
-    raw_numWords,
-    raw_ck_B,
-    raw_ck_A,
-    time_raw_ck_A,
-    time_raw_ck_B,
-    -1,
-    timestampMessage_galileo,
-)
-"""Data to use to test the database"""
+UBLOX_MESSAGE_PAYLOAD_HEX = UBLOX_MESSAGE_PAYLOAD.hex()
+"""Ublox message payload in hex format, computed once per process"""
+
+
+def make_data_to_store(now: int = None) -> tuple:
+    """
+    Build the tuple of data to use to test the database
+
+    :param now: Reception time in ms, defaults to the call-time clock
+    :return: The tuple of data to store
+    """
+    return (
+        now or int(time.time() * 1000),
+        timestampMessage_unix,
+        raw_galTow,
+        raw_galWno,
+        raw_leapS,
+        UBLOX_MESSAGE_PAYLOAD_HEX,
+        GALILEO_MESSAGE_PAYLOAD,
+        0,
+        raw_svId,
+        raw_numWords,
+        raw_ck_B,
+        raw_ck_A,
+        time_raw_ck_A,
+        time_raw_ck_B,
+        -1,
+        timestampMessage_galileo,
+    )
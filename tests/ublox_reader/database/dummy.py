@@ -22,7 +22,9 @@ Dummy DataBase class useful for testing
     limitations under the License.
 """
 # Standard Library
+import asyncio
 from logging import Logger
+from typing import Optional
 
 # Asynchronous libraries
 import asyncpg
@@ -45,6 +47,46 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
+####################
+# ADMIN CONNECTION #
+####################
+
+
+_admin_conn: Optional[asyncpg.Connection] = None
+"""Admin connection kept alive across tests to destroy the databases"""
+
+_admin_lock: Optional[asyncio.Lock] = None
+"""
+Lock guarding the lazy setup and the use of the admin connection,
+created lazily inside the running loop because on older Python
+versions a Lock binds the event loop at construction
+"""
+
+
+def _get_admin_lock() -> asyncio.Lock:
+    """
+    Create the admin lock the first time it is needed
+    """
+    global _admin_lock
+    if _admin_lock is None:
+        _admin_lock = asyncio.Lock()
+    return _admin_lock
+
+
+async def close_admin_connection() -> None:
+    """
+    Close the keep-alive admin connection, called by the session
+    finalizer so the connection isn't abandoned at interpreter exit
+    """
+    global _admin_conn
+    if _admin_conn is not None and not _admin_conn.is_closed():
+        await _admin_conn.close()
+    _admin_conn = None
+
+
+# ------------------------------------------------------------------------------
+
+
 ##################
 # DUMMY DATABASE #
 ##################
@@ -100,19 +142,22 @@ class DummyDataBase(DataBase):
 
     async def destroy_database(self):
         """
-        Destroy the database
+        Destroy the database reusing a keep-alive admin connection
         """
-        sys_conn = await asyncpg.connect(
-            host=self.host,
-            user=self.user,
-            port=self.port,
-            password=self.password,
-            database="template1",
-        )
-        # delete the database
-        await sys_conn.execute(f"DROP DATABASE {self.database};")
-        # close the connection
-        await sys_conn.close()
+        global _admin_conn
+
+        async with _get_admin_lock():
+            # Lazily open the admin connection only once per session
+            if _admin_conn is None or _admin_conn.is_closed():
+                _admin_conn = await asyncpg.connect(
+                    host=self.host,
+                    user=self.user,
+                    port=self.port,
+                    password=self.password,
+                    database="template1",
+                )
+            # delete the database
+            await _admin_conn.execute(f'DROP DATABASE IF EXISTS "{self.database}";')
 
     async def close(self):
         """
@@ -34,7 +34,7 @@ import pytest
 import uvloop
 
 # DummyDataBase
-from tests.constants import DATA_TO_STORE
+from tests.constants import make_data_to_store
 from tests.ublox_reader.database.dummy import DummyDataBase
 from ublox_reader.database.constants import DataBaseException
 from ublox_reader.utilities import UbloxLogger
@@ -53,14 +53,10 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
-@pytest.fixture()
-def event_loop():
-    """
-    Set uvloop as the default event loop
-    """
-    loop = uvloop.Loop()
-    yield loop
-    loop.close()
+# Build the disabled test logger only once per process
+LOGGER = UbloxLogger.get_logger("test")
+"""Shared disabled logger for the tests"""
+LOGGER.disabled = True
 
 
 class TestDataBase:
@@ -70,8 +66,8 @@ class TestDataBase:
 
     # instantiate in this way to fix the warning
     loop: Union[uvloop.Loop, asyncio.AbstractEventLoop] = None
-    # add logger
-    logger: Logger = UbloxLogger.get_logger("test")
+    # add the shared disabled logger
+    logger: Logger = LOGGER
 
     async def configure(self):
         """
@@ -80,9 +76,6 @@ class TestDataBase:
         # Get the event loop
         self.loop = asyncio.get_running_loop()
 
-        # Disable the logger
-        self.logger.disabled = True
-
     @pytest.mark.asyncio
     async def test_setup(self):
         """
@@ -125,5 +118,5 @@ class TestDataBase:
         database = await DummyDataBase.setup(self.logger, self.loop)
 
         # Store data
-        await database.store_data("test_table", DATA_TO_STORE)
+        await database.store_data("test_table", make_data_to_store())
         await database.close()
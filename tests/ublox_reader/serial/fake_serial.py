@@ -28,19 +28,27 @@ import pty
 import time
 import threading
 from logging import Logger
-from typing import AsyncIterable, Union
+from typing import Union
 
 # Asynchronous libraries
 from uvloop import Loop
 
 # SerialReceiver
 from ublox_reader.serial.receiver import SerialReceiver
-from ublox_reader.serial.constants import SETUP_BYTES, UbloxSerialException
+from ublox_reader.serial.constants import SETUP_BYTES_FLAT, UbloxSerialException
 from tests.constants import FAKE_DATA
 
 # Open the pseudoterminal
 master, slave = pty.openpty()
 
+# Parse the fake data only once at import time
+with open(FAKE_DATA, "r") as fp:
+    FAKE_FRAMES = tuple(bytes.fromhex(line) for line in fp)
+"""Fake ublox messages pre-decoded from :const:`FAKE_DATA`"""
+
+SETUP_CONCAT = SETUP_BYTES_FLAT
+"""Setup bytes concatenated once to check them with a single comparison"""
+
 # ------------------------------------------------------------------------------
 
 
@@ -78,12 +86,25 @@ class FakeSerialReceiver:
         self.simulate = simulate
         # stop event
         self.stop_event = threading.Event()
-        # start the simulation of the receiver after timer
-        self.start_simulation = threading.Timer(1, self.mock_device)
-        # set the name
-        self.start_simulation.setName("simulate_the_device")
-        # start the timer
-        self.start_simulation.start()
+        # event set when the serial setup is done and the simulation can start
+        self.ready_event = threading.Event()
+        # daemon thread that simulates the receiver hardware
+        self.simulation = threading.Thread(
+            target=self._simulate_device, name="simulate_the_device", daemon=True
+        )
+        # start the thread, it will wait for the ready event
+        self.simulation.start()
+
+    def _simulate_device(self):
+        """
+        Wait for the serial setup to complete, then simulate the hardware
+        """
+        # Wait the signal from the setup
+        self.ready_event.wait()
+
+        # Check if the setup failed
+        if not self.stop_event.is_set():
+            self.mock_device()
 
     @classmethod
     async def setup(cls, logger, loop, simulate="all", port=os.ttyname(slave)):
@@ -107,11 +128,13 @@ class FakeSerialReceiver:
 
         except UbloxSerialException:
             # Stop the simulation of the hardware
-            self.start_simulation.cancel()
+            self.stop_event.set()
+            self.ready_event.set()
             # Re raise the exception
             raise UbloxSerialException
 
-        # everything ok
+        # Setup done, start the simulation of the hardware
+        self.ready_event.set()
         return self
 
     def mock_device(self, msg_per_second=20):
@@ -121,29 +144,32 @@ class FakeSerialReceiver:
 
         :param msg_per_second: Number of messages sent by the receiver in one second
         """
-        # Check if the setup bytes are received well
-        for i in range(len(SETUP_BYTES)):
-            assert (
-                os.read(master, len(SETUP_BYTES[i])) == SETUP_BYTES[i]
-            ), "Bytes read should be equal to SETUP_BYTES"
+        # Check if the setup bytes are received well, reading them in bulk
+        received = bytearray()
+        while len(received) < len(SETUP_CONCAT):
+            received.extend(os.read(master, len(SETUP_CONCAT) - len(received)))
+        assert received == SETUP_CONCAT, "Bytes read should be equal to SETUP_BYTES"
 
         # Check if the simulation will be complete
         if self.simulate == "all":
-            # Open the file, and send the message to the fake serial port
-            with open(FAKE_DATA, "r") as fp:
-                for line in fp:
-                    # Check if the simulation has ben interrupted
-                    if not self.stop_event.is_set():
-                        os.write(master, bytearray.fromhex(line))
-                        # sleep to have a correct number of messages send in one second
-                        time.sleep(1 / msg_per_second)
-
-    async def ublox_message(self) -> AsyncIterable[bytearray]:
+            # Send the pre-decoded messages to the fake serial port in batches
+            deadline = time.monotonic()
+            for start in range(0, len(FAKE_FRAMES), 5):
+                # Check if the simulation has ben interrupted
+                if self.stop_event.is_set():
+                    break
+                batch = FAKE_FRAMES[start:start + 5]
+                os.writev(master, batch)
+                # pace against a monotonic deadline to have a correct
+                # number of messages send in one second without drift
+                deadline += len(batch) / msg_per_second
+                time.sleep(max(0.0, deadline - time.monotonic()))
+
+    async def next_ublox_message(self) -> bytes:
         """
-        Wraps SerialReceiver.ublox_message method
+        Wraps SerialReceiver.next_ublox_message method
         """
-        async for message in self.serial.ublox_message():
-            yield message
+        return await self.serial.next_ublox_message()
 
     def close(self):
         """
@@ -158,4 +184,4 @@ class FakeSerialReceiver:
         await self.serial.stop_serial()
         # set stop event and await the thread to finish it's job
         self.stop_event.set()
-        self.start_simulation.join()
+        self.simulation.join()
@@ -24,7 +24,9 @@ Tests the ublox_reader.serial package
 
 # Standard library
 import asyncio
+import os
 import random
+from itertools import accumulate
 from logging import Logger
 from typing import Union, List
 
@@ -59,14 +61,10 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
-@pytest.fixture()
-def event_loop():
-    """
-    Set uvloop as the default event loop
-    """
-    loop = uvloop.Loop()
-    yield loop
-    loop.close()
+# Build the disabled test logger only once per process
+LOGGER = UbloxLogger.get_logger("test")
+"""Shared disabled logger for the tests"""
+LOGGER.disabled = True
 
 
 class TestSerial:
@@ -76,10 +74,12 @@ class TestSerial:
 
     # instantiate in this way to fix the warning
     loop: Union[uvloop.Loop, asyncio.AbstractEventLoop] = None
-    # add logger
-    logger: Logger = UbloxLogger.get_logger("test")
+    # add the shared disabled logger
+    logger: Logger = LOGGER
     # message list
-    message_list: List[Union[int, bytearray]] = None
+    message_list: List[bytes] = None
+    # modification time of the fake data file used to build the message list
+    message_list_mtime: float = None
     # random exception raised in a random iteration
     random_exception: int = None
 
@@ -93,18 +93,24 @@ class TestSerial:
         # Get the event loop
         self.loop = asyncio.get_running_loop()
 
-        # Disable the logger
-        self.logger.disabled = True
-
         # check if fake messages have to be stored
         if with_message:
-            # store fake_data
-            with open(FAKE_DATA, "r") as fp:
-                self.message_list = [
-                    # remove the first two bytes cause they are the delimeter
-                    bytearray.fromhex(line)[2:]
-                    for line in fp
+            # parse fake_data only if the file changed since the last test
+            mtime = os.path.getmtime(FAKE_DATA)
+            if TestSerial.message_list is None or TestSerial.message_list_mtime != mtime:
+                with open(FAKE_DATA, "r") as fp:
+                    lines = fp.read().split()
+                # decode every message in a single flat buffer,
+                # removing the first two bytes cause they are the delimeter
+                flat = b"".join(bytes.fromhex(line)[2:] for line in lines)
+                lengths = [len(line) // 2 - 2 for line in lines]
+                starts = [0, *accumulate(lengths)]
+                # every message is a slice of the same backing buffer
+                TestSerial.message_list = [
+                    flat[start:start + length]
+                    for start, length in zip(starts, lengths)
                 ]
+                TestSerial.message_list_mtime = mtime
             # check if an exception has to be risen
             if with_exception:
                 # Generate an exception in a random iteration
@@ -135,7 +141,7 @@ class TestSerial:
     @pytest.mark.asyncio
     async def test_ublox_message_with_no_exception(self):
         """
-        Test ublox_message method without exceptions
+        Test next_ublox_message method without exceptions
         """
         # setup the test
         await self.configure(with_message=True)
@@ -144,10 +150,10 @@ class TestSerial:
         receiver = await FakeSerialReceiver.setup(self.logger, self.loop)
 
         # try to get all data correctly
-        for i in range(0, len(self.message_list)):
-            # get_messages from the serial connection
-            async for message in receiver.ublox_message():
-                assert message == self.message_list[i], "Bytes should be equal"
+        for expected in self.message_list:
+            # get a message from the serial connection
+            message = await receiver.next_ublox_message()
+            assert message == expected, "Bytes should be equal"
 
         # cleanup
         await receiver.stop_serial()
@@ -155,7 +161,7 @@ class TestSerial:
     @pytest.mark.asyncio
     async def test_ublox_message_with_exception(self):
         """
-        Test ublox_message method with exceptions
+        Test next_ublox_message method with exceptions
         """
         # setup test
         await self.configure(with_message=True, with_exception=True)
@@ -166,12 +172,12 @@ class TestSerial:
         # Check if the receiver raise the exception correctly
         with pytest.raises(UbloxSerialException):
             # try to get all data correctly
-            for i in range(0, len(self.message_list)):
-                # get messages from the serial connection
-                async for message in receiver.ublox_message():
-                    assert message == self.message_list[i], "Bytes should be equal"
-                    # check if we have to raise an exception
-                    if i == self.random_exception:
-                        receiver.close()
+            for i, expected in enumerate(self.message_list):
+                # get a message from the serial connection
+                message = await receiver.next_ublox_message()
+                assert message == expected, "Bytes should be equal"
+                # check if we have to raise an exception
+                if i == self.random_exception:
+                    receiver.close()
         # cleanup
         await receiver.stop_serial()
@@ -23,16 +23,7 @@ Tests the utilities module
 """
 
 # Standard library
-import asyncio
 from datetime import datetime
-from functools import partial
-from concurrent.futures import ThreadPoolExecutor
-
-# Test
-import pytest
-
-# fast event loop
-import uvloop
 
 # utility methods
 from ublox_reader.utilities import DataParser
@@ -54,16 +45,6 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
-@pytest.fixture()
-def event_loop():
-    """
-    Set uvloop as the default event loop
-    """
-    loop = uvloop.Loop()
-    yield loop
-    loop.close()
-
-
 class TestUtilities:
     """
     Test the utilities methods
@@ -30,6 +30,7 @@ import signal
 from typing import Union
 
 # Asynchronous libraries
+import uvloop
 from uvloop import Loop
 
 # Ublox
@@ -80,8 +81,8 @@ class DummyUblox(UbloxReceiver):
         case of a keyboard interrupt, stop the Reader and cleanup
         gracefully
         """
-        # Get a new instance of the Event Loop
-        loop = asyncio.new_event_loop()
+        # Get a new instance of the Event Loop directly from uvloop
+        loop = uvloop.new_event_loop()
         # Set as the default loop of this thread
         asyncio.set_event_loop(loop)
 
@@ -98,7 +99,7 @@ class DummyUblox(UbloxReceiver):
 
         except (DataBaseException, UbloxSerialException):
             # Something went wrong
-            loop.run_until_complete(DummyUblox.shut_down())
+            loop.run_until_complete(DummyUblox.cancel_pending_tasks())
             loop.close()
             return
 
@@ -114,7 +115,8 @@ class DummyUblox(UbloxReceiver):
             # Schedule the stop of the execution
             loop.call_later(1, ublox_reader.stop_test)
             # Schedule get_data and parse data
-            loop.create_task(ublox_reader.get_data())
+            ublox_reader.spawn(ublox_reader.get_data())
+            ublox_reader.spawn(ublox_reader.parse_received_data())
 
             # Get data, parse and store until a OS signal
             loop.run_forever()
@@ -153,7 +155,7 @@ class DummyUblox(UbloxReceiver):
         serial receiver is still sending data to the fake serial connection.
         When the fake data are ended, it will raise an exception to stop the execution
         """
-        if self.serial.start_simulation.is_alive():
+        if self.serial.simulation.is_alive():
             self.loop.call_later(1, self.stop_test)
         else:
             raise Exception
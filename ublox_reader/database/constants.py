@@ -42,21 +42,85 @@ __docformat__ = "restructuredtext en"
 ############
 
 
-DB_HOST = config.get("POSTGRESQL", "HOST")
+# Fetch the section only once instead of walking the config at every get
+_postgresql = config["POSTGRESQL"]
+
+DB_HOST = _postgresql["HOST"]
 """Database host address"""
 
-DB_PORT = config.getint("POSTGRESQL", "PORT")
+DB_PORT = int(_postgresql["PORT"])
 """ Port number to connect to at the server host"""
 
-DB_USER = config.get("POSTGRESQL", "USER")
+DB_USER = _postgresql["USER"]
 """The name of the user of the database used for authentication"""
 
-DB = config.get("POSTGRESQL", "DB")
+DB = _postgresql["DB"]
 """The name of the database to connect to"""
 
-DB_PWD = config.get("POSTGRESQL", "PWD")
+DB_PWD = _postgresql["PWD"]
 """Password to be used for authentication"""
 
+DB_POOL_MIN_SIZE = int(_postgresql.get("POOL_MIN_SIZE", 4))
+"""Connections established eagerly when the pool is created"""
+
+DB_POOL_MAX_SIZE = int(_postgresql.get("POOL_MAX_SIZE", 10))
+"""Upper bound of the connection pool"""
+
+# ------------------------------------------------------------------------------
+
+
+###########
+# QUERIES #
+###########
+
+
+DB_COLUMNS = (
+    "receptiontime",
+    "timestampmessage_unix",
+    "raw_galtow",
+    "raw_galwno",
+    "raw_leaps",
+    "raw_data",
+    "galileo_data",
+    "raw_authbit",
+    "raw_svid",
+    "raw_numwords",
+    "raw_ck_b",
+    "raw_ck_a",
+    "raw_ck_a_time",
+    "raw_ck_b_time",
+    "osnma",
+    "timestampmessage_galileo",
+)
+"""Columns of every table, in the same order of the data to store"""
+
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS "{}" (
+receptiontime bigint,
+timestampmessage_unix bigint,
+PRIMARY KEY (timestampmessage_unix),
+raw_galtow integer,
+raw_galwno integer,
+raw_leaps integer,
+raw_data text,
+galileo_data text,
+raw_authbit bigint,
+raw_svid integer,
+raw_numwords integer,
+raw_ck_b integer,
+raw_ck_a integer,
+raw_ck_a_time integer,
+raw_ck_b_time integer,
+osnma integer,
+timestampmessage_galileo bigint
+);
+"""
+"""Query template to create a table, to format with the table name"""
+
+CREATE_INDEX_QUERY = """CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_timestampmessage_unix on "{}"
+(timestampmessage_unix DESC NULLS LAST);"""
+"""Query template to create the timestamp index of a table, to format with the table name"""
+
 # ------------------------------------------------------------------------------
 
 
@@ -24,14 +24,30 @@ Asynchronous database for UbloxReader
 
 # Standard library
 import asyncio
+import re
+import socket
+from collections import defaultdict
 from logging import Logger
+from typing import List
 
 # Asynchronous libraries
 import asyncpg
 from uvloop import Loop
 
 # constants
-from .constants import DB_HOST, DB_PORT, DB_USER, DB_PWD, DB, DataBaseException
+from .constants import (
+    DB_HOST,
+    DB_PORT,
+    DB_USER,
+    DB_PWD,
+    DB,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_COLUMNS,
+    CREATE_TABLE_QUERY,
+    CREATE_INDEX_QUERY,
+    DataBaseException,
+)
 
 # ------------------------------------------------------------------------------
 
@@ -47,6 +63,35 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
+TABLE_NAME_PATTERN = re.compile(r"\w+\Z")
+"""Precompiled pattern of a valid table name like 2021_GALILEO_3"""
+
+
+# ------------------------------------------------------------------------------
+
+
+async def tune_connection(connection: asyncpg.Connection) -> None:
+    """
+    Tune the TCP socket of a freshly opened connection of the pool,
+    passed as the init hook of create_pool so it runs once per
+    connection: disable Nagle's algorithm to avoid coalescing latency
+    on the insert stream and enlarge the kernel buffers to sustain
+    the throughput on fast links
+
+    :param connection: Connection to tune
+    """
+    sock = connection._transport.get_extra_info("socket")
+    # Unix domain sockets don't have TCP options
+    if sock is None or sock.family != socket.AF_INET and sock.family != socket.AF_INET6:
+        return
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+
+
+# ------------------------------------------------------------------------------
+
+
 ############
 # DATABASE #
 ############
@@ -71,6 +116,8 @@ class DataBase:
         user: str,
         password: str,
         database: str,
+        pool_min_size: int = DB_POOL_MIN_SIZE,
+        pool_max_size: int = DB_POOL_MAX_SIZE,
     ) -> None:
         """
         Setup Database
@@ -82,6 +129,8 @@ class DataBase:
         :param user: User of the database
         :param password: Password of the database
         :param database: Database name
+        :param pool_min_size: Connections established eagerly at setup
+        :param pool_max_size: Upper bound of the connection pool
         """
         # Logging
         self.logger = logger
@@ -93,12 +142,24 @@ class DataBase:
         self.user = user
         self.password = password
         self.database = database
-        # Pool constants
-        self.pool_min_size = 1
-        self.pool_max_size = 10
+        # Pool constants, create_pool opens min_size connections
+        # eagerly so the first store doesn't pay the handshake
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
         self.inactive_connection_lifetime = 60
         # timeout
         self.timeout = 20
+        # prepared statement cache, the set of queries is small and
+        # stable so never expire the cached statements
+        self.statement_cache_size = 128
+        self.cached_statement_lifetime = 0
+        # batching of the inserts
+        self.batch_max_size = 100
+        self.batch_max_delay = 0.1
+        self.store_queue = asyncio.Queue(maxsize=10000)
+        self.store_task = None
+        # table names already checked against TABLE_NAME_PATTERN
+        self.valid_tables = set()
 
     @classmethod
     async def setup(
@@ -132,14 +193,14 @@ class DataBase:
 
         except OSError as error:
             # Log the exception
-            self.logger.error(f"can't connect to the db {error.strerror}")
+            self.logger.error("can't connect to the db %s", error.strerror)
 
             # raise exception to sto the execution
             raise DataBaseException
 
         except asyncpg.PostgresError as error:
             # Log the exception
-            self.logger.error(f"{str(error.as_dict())}")
+            self.logger.error("%s", error.as_dict())
 
             # raise exception to sto the execution
             raise DataBaseException
@@ -153,138 +214,221 @@ class DataBase:
         If the db doesn't exist, create it and assign to
         the specified user
         """
-        try:
-            # create a connection pool
-            self.pool = await asyncio.wait_for(
-                asyncpg.create_pool(
-                    min_size=self.pool_min_size,
-                    max_size=self.pool_max_size,
-                    max_inactive_connection_lifetime=self.inactive_connection_lifetime,
-                    loop=self.loop,
+        while True:
+            try:
+                # create a connection pool
+                self.pool = await asyncio.wait_for(
+                    asyncpg.create_pool(
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        max_inactive_connection_lifetime=self.inactive_connection_lifetime,
+                        loop=self.loop,
+                        host=self.host,
+                        port=self.port,
+                        user=self.user,
+                        password=self.password,
+                        database=self.database,
+                        init=tune_connection,
+                        statement_cache_size=self.statement_cache_size,
+                        max_cached_statement_lifetime=self.cached_statement_lifetime,
+                    ),
+                    timeout=self.timeout,
+                )
+                # Database Log
+                self.logger.info("created a connection pool to %s", self.host)
+                return
+
+            except asyncio.TimeoutError:
+                # log the error
+                self.logger.error("timeout reached, can't connect to the database")
+                # raise exception to stop the execution
+                raise DataBaseException
+
+            except asyncpg.InvalidCatalogNameError:
+                # Database does not exist, create it
+                self.logger.warning("database %s doesn't exist", self.database)
+
+                # create a single connection to the default user and the database template
+                sys_conn = await asyncpg.connect(
                     host=self.host,
-                    port=self.port,
                     user=self.user,
+                    port=self.port,
                     password=self.password,
-                    database=self.database,
-                ),
-                timeout=self.timeout,
-            )
-            # Database Log
-            self.logger.info(f"created a connection pool to {self.host}")
-
-        except asyncio.TimeoutError:
-            # log the error
-            self.logger.error("timeout reached, can't connect to the database")
-            # raise exception to stop the execution
-            raise DataBaseException
-
-        except asyncpg.InvalidCatalogNameError:
-            # Database does not exist, create it
-            self.logger.warning(f"database {self.database} doesn't exist")
-
-            # create a single connection to the default user and the database template
-            sys_conn = await asyncpg.connect(
-                host=self.host,
-                user=self.user,
-                port=self.port,
-                password=self.password,
-                database="template1",
-            )
-            # create the database
-            await sys_conn.execute(
-                f'CREATE DATABASE "{self.database}" OWNER "{self.user}";'
-            )
-            # close the connection
-            await sys_conn.close()
-            # Database Log
-            self.logger.info(f"created database {self.database}")
+                    database="template1",
+                )
+                # create the database
+                await sys_conn.execute(
+                    f'CREATE DATABASE "{self.database}" OWNER "{self.user}";'
+                )
+                # close the connection
+                await sys_conn.close()
+                # Database Log
+                self.logger.info("created database %s", self.database)
 
-            # Connect to the newly created database.
-            await self.create_database_if_not_exist()
+                # Connect to the newly created database at the next iteration
 
     async def store_data(self, table: str, data_to_store: tuple) -> None:
         """
-        Use a connection from the pool to insert the data in the db
-        and check if the insertion is successful then release the
-        connection. If the table in which the data must be stored doesn't
-        exist, it will create it. In case all the connections in the pool are busy,
-        await for a connection to be free.
+        Enqueue the data to store. A background task drains the queue
+        and inserts the data in batches, so every message pays only the
+        cost of a queue put. If the queue is full, await for the
+        background task to catch up.
 
         :param table: Database table
-        :param data_to_store:
-        :return:
+        :param data_to_store: Tuple of data to store in the table
         """
-        try:
-            # Take a connection from the pool and execute the query
-            await self.pool.execute(
-                f"""
-                INSERT INTO "{table}" (
-                receptiontime,
-                timestampmessage_unix,
-                raw_galtow,
-                raw_galwno,
-                raw_leaps,
-                raw_data,
-                galileo_data,
-                raw_authbit,
-                raw_svid,
-                raw_numwords,
-                raw_ck_b,
-                raw_ck_a,
-                raw_ck_a_time,
-                raw_ck_b_time,
-                osnma,
-                timestampmessage_galileo
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16);""",
-                *data_to_store,
+        # Validate the table name only the first time it is seen,
+        # it ends up formatted inside the table creation queries
+        if table not in self.valid_tables:
+            if not TABLE_NAME_PATTERN.match(table):
+                raise DataBaseException(f"invalid table name {table}")
+            self.valid_tables.add(table)
+
+        # Start the background store task lazily
+        if self.store_task is None:
+            self.store_task = asyncio.get_running_loop().create_task(
+                self._store_from_queue()
             )
+        # Enqueue the data
+        await self.store_queue.put((table, data_to_store))
 
-        # Check if the table does'nt exist
-        except asyncpg.UndefinedTableError:
-            # Log the error code
-            self.logger.warning(f"relation {table} doesn't exist")
-
-            # Create the table
-            async with self.pool.acquire() as con:
-                await con.execute(
-                    f"""
-                        CREATE TABLE IF NOT EXISTS "{table}" (
-                        receptiontime bigint,
-                        timestampmessage_unix bigint,
-                        PRIMARY KEY (timestampmessage_unix),
-                        raw_galtow integer,
-                        raw_galwno integer,
-                        raw_leaps integer,
-                        raw_data text,
-                        galileo_data text,
-                        raw_authbit bigint,
-                        raw_svid integer,
-                        raw_numwords integer,
-                        raw_ck_b integer,
-                        raw_ck_a integer,
-                        raw_ck_a_time integer,
-                        raw_ck_b_time integer,
-                        osnma integer,
-                        timestampmessage_galileo bigint
-                        );
-                         """
-                )
-                # Log
-                self.logger.info(f"relation {table} created")
+    async def _store_from_queue(self) -> None:
+        """
+        Background task that drains the store queue and inserts the
+        data grouped by table, batching up to batch_max_size rows or
+        batch_max_delay seconds of data per round-trip
+        """
+        while True:
+            # Wait for the first element of the batch
+            table, data = await self.store_queue.get()
+            batch = defaultdict(list)
+            batch[table].append(data)
+            size = 1
+
+            # Collect more data until the batch is full or the delay expires
+            while size < self.batch_max_size:
+                try:
+                    table, data = await asyncio.wait_for(
+                        self.store_queue.get(), timeout=self.batch_max_delay
+                    )
+                except asyncio.TimeoutError:
+                    break
+                batch[table].append(data)
+                size += 1
+
+            try:
+                # Store every table batch
+                for table, rows in batch.items():
+                    await self._store_rows(table, rows)
+
+            except asyncio.CancelledError:
+                # the database is closing
+                raise
+
+            except asyncpg.PostgresError as error:
+                # Log and keep the task alive, losing only this batch
+                self.logger.error("error storing a batch %s", error.as_dict())
+
+            except Exception as error:
+                # Log and keep the task alive, losing only this batch
+                self.logger.error("unexpected error storing a batch %s", error)
+
+            finally:
+                # Notify the queue even on failure, so the join of
+                # the shutdown never waits for a lost batch
+                for _ in range(size):
+                    self.store_queue.task_done()
+
+    async def _store_rows(self, table: str, rows: List[tuple]) -> None:
+        """
+        Insert a batch of rows in a table. If the table in which the
+        data must be stored doesn't exist, it will create it. In case
+        all the connections in the pool are busy, await for a
+        connection to be free.
 
-                # Create a index for the table
-                await con.execute(
-                    f"""CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_timestampmessage_unix on "{table}"
-                     (timestampmessage_unix DESC NULLS LAST);"""
+        :param table: Database table
+        :param rows: Batch of rows to store in the table
+        """
+        while True:
+            try:
+                # Take a connection from the pool and stream the batch
+                # with a single binary COPY
+                async with self.pool.acquire() as con:
+                    await con.copy_records_to_table(
+                        table, records=rows, columns=DB_COLUMNS
+                    )
+                return
+
+            # Check if the table does'nt exist
+            except asyncpg.UndefinedTableError:
+                # Log the error code
+                self.logger.warning("relation %s doesn't exist", table)
+
+                # Create the table
+                async with self.pool.acquire() as con:
+                    await con.execute(CREATE_TABLE_QUERY.format(table))
+                    # Log
+                    self.logger.info("relation %s created", table)
+
+                    # Create a index for the table
+                    await con.execute(CREATE_INDEX_QUERY.format(table))
+
+                # store the batch in the new table at the next iteration
+
+            except asyncpg.UniqueViolationError:
+                # Two messages of a satellite in the same second share
+                # the timestamp primary key, store the batch row by row
+                # so only the duplicates are lost
+                await self._store_rows_one_by_one(table, rows)
+                return
+
+            except (OSError, asyncpg.PostgresConnectionError) as error:
+                # Transient connection trouble, retry the batch
+                self.logger.warning(
+                    "connection error storing in %s, retrying: %s", table, error
                 )
+                await asyncio.sleep(1)
 
-            # store data in the new table
-            await self.store_data(table, data_to_store)
+    async def _store_rows_one_by_one(self, table: str, rows: List[tuple]) -> None:
+        """
+        Fallback of _store_rows used when a batch violates the
+        timestamp primary key: insert the rows one at a time and
+        drop only the conflicting ones
+
+        :param table: Database table
+        :param rows: Batch of rows to store in the table
+        """
+        async with self.pool.acquire() as con:
+            for row in rows:
+                try:
+                    await con.copy_records_to_table(
+                        table, records=[row], columns=DB_COLUMNS
+                    )
+                except asyncpg.UniqueViolationError:
+                    # Log the dropped duplicate
+                    self.logger.warning(
+                        "duplicate timestamp %s for relation %s, row dropped",
+                        row[1],
+                        table,
+                    )
 
     async def close(self) -> None:
         """
         Close all the connections to the Database
         """
+        # Wait for the queued data to be stored, then stop the task;
+        # a timeout here must not prevent the pool from closing
+        if self.store_task is not None and not self.store_task.done():
+            try:
+                await asyncio.wait_for(self.store_queue.join(), timeout=5)
+            except asyncio.TimeoutError:
+                # Timeout expired
+                self.logger.warning("timeout draining the store queue")
+            finally:
+                self.store_task.cancel()
+                # Wait for the task, suppressing its cancellation
+                await asyncio.gather(self.store_task, return_exceptions=True)
+
         try:
             # Close gracefully the connection pool
             await asyncio.wait_for(self.pool.close(), timeout=1)
@@ -295,4 +439,4 @@ class DataBase:
 
         finally:
             # Log
-            self.logger.info(f"disconnected from {self.host}")
+            self.logger.info("disconnected from %s", self.host)
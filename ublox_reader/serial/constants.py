@@ -42,10 +42,13 @@ __docformat__ = "restructuredtext en"
 ##########
 
 
-SERIAL_PORT = config.get("SERIAL", "PORT")
+# Fetch the section only once instead of walking the config at every get
+_serial = config["SERIAL"]
+
+SERIAL_PORT = _serial["PORT"]
 """Serial port used by the Ublox Receiver"""
 
-SERIAL_BAUDRATE = config.getint("SERIAL", "BAUDRATE")
+SERIAL_BAUDRATE = int(_serial["BAUDRATE"])
 """Baudrate of the serial connection"""
 
 # ------------------------------------------------------------------------------
@@ -133,6 +136,12 @@ Bytes used to setup the Serial Receiver in order to disable/enable
 a specific message
 """
 
+SETUP_BYTES_FLAT = b"".join(SETUP_BYTES)
+"""
+Setup bytes flattened in a single buffer, sent with one write.
+The UART doesn't care about the frame boundaries
+"""
+
 DELIMETER = bytes([0xB5, 0x62])
 """
 Delimeter of every Ublox Message
@@ -23,8 +23,8 @@ Asynchronous serial receiver for UbloxReader
 """
 
 # Standard library
+import struct
 from logging import Logger
-from typing import AsyncIterable
 
 # Asynchronous libraries
 from aioserial import AioSerial, SerialException
@@ -33,7 +33,7 @@ from uvloop import Loop
 # constants
 from .constants import (
     SERIAL_PORT,
-    SETUP_BYTES,
+    SETUP_BYTES_FLAT,
     SERIAL_BAUDRATE,
     DELIMETER,
     UbloxSerialException,
@@ -52,6 +52,22 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
+LENGTH_STRUCT = struct.Struct("<H")
+"""Precompiled layout of the 2-byte little endian payload length field"""
+
+CLEANING = 0
+"""State while cleaning the incorrect buffer data sent after the setup"""
+
+FIRST_MESSAGE = 1
+"""State of the first message after the cleaning, without the delimeter"""
+
+STEADY = 2
+"""Steady state, every message begins with the delimeter"""
+
+
+# ------------------------------------------------------------------------------
+
+
 ###################
 # SERIAL RECEIVER #
 ###################
@@ -78,12 +94,22 @@ class SerialReceiver(AioSerial):
         # reading flag
         self.start_reading = False  # type: bool
 
-        # ublox-message flags
-        self.first_ublox_message_after_cleaning = False
-        self.ublox_messages = False
-        self.cleaning_ublox_buffer = True
+        # ublox-message state machine, a tuple of bound methods
+        # indexed by the current state is cheaper than checking
+        # one flag per state at every message
+        self.state = CLEANING
+        self.read_message = (
+            self._read_cleaning_buffer,
+            self._read_first_message,
+            self._read_steady_message,
+        )
         self.ublox_counter = 0
 
+        # read ahead buffer, refilled with everything the kernel
+        # already holds so a frame costs at most one read per refill
+        self.rx_buffer = bytearray()
+        self.rx_position = 0
+
     @classmethod
     async def setup(cls, logger, loop, port=SERIAL_PORT, baudrate=SERIAL_BAUDRATE):
         # type: (Logger, Loop, str, int) -> SerialReceiver
@@ -102,10 +128,10 @@ class SerialReceiver(AioSerial):
             self = SerialReceiver(logger, loop, port, baudrate)
 
             # SerialReceiver Log
-            self.logger.info(f"connected to {self.port}")
+            self.logger.info("connected to %s", self.port)
 
-            # Set up serial communication
-            await self.writelines_async(SETUP_BYTES)
+            # Set up serial communication with a single write
+            await self.write_async(SETUP_BYTES_FLAT)
             # Log
             self.logger.info("setup bytes send")
             # Shutdown  serial writer executor cause we won't write anymore serial data
@@ -113,16 +139,17 @@ class SerialReceiver(AioSerial):
 
         except SerialException as error:
             # Log the exception
-            logger.error(f"{error.strerror}")
+            logger.error("%s", error.strerror)
             # Set flag to stop the receiver
             raise UbloxSerialException
         # Setup made correctly, return self
         return self
 
-    async def ublox_message(self) -> AsyncIterable[bytes]:
+    async def next_ublox_message(self) -> bytes:
         """
-        Asynchronous generator
-        that returns a ublox message at every iteration.
+        Coroutine that returns a ublox message at every call.
+        A plain coroutine is cheaper than an async generator
+        yielding a single message.
 
         Every ublox message frame has this structure:
 
@@ -146,7 +173,7 @@ class SerialReceiver(AioSerial):
 
                 - 1-byte **CK_B**
 
-        The work done by the asynchronous generator can be divided in 4 steps:
+        The work done by the coroutine can be divided in 4 steps:
 
             **1.** read and drop the **Preamble**
 
@@ -168,82 +195,148 @@ class SerialReceiver(AioSerial):
             self.start_reading = True
 
         try:
-
-            # Check if we need to clean the buffer
-            if self.cleaning_ublox_buffer:
-                # Version 8 of ublox receiver has some incorrect buffer data sent after the setup
-
-                # Remove the delimeter
-                message = bytes(await self.read_until_async(DELIMETER))[:-2]
-                len_message = len(message)
-
-                # Check if the message has an acceptable size
-                while len_message < 24:
-                    message = bytes(await self.read_until_async(DELIMETER))[:-2]
-                    len_message = len(message)
-
-                # Give the message
-                yield message
-
-                # Increase the number of correct sent messages
-                self.ublox_counter += 1
-
-                # Check if we sent at least 5 correct messages
-                if self.ublox_counter == 5:
-
-                    # Set the flags
-                    self.cleaning_ublox_buffer = False
-                    self.first_ublox_message_after_cleaning = True
-                    return
-
-            # Check the status of this message
-            elif self.first_ublox_message_after_cleaning:
-                # This message doesn't have the delimeter at the beginning cause it was cleaned with the buffer
-
-                # Empty message
-                message = bytearray()
-                # Save the first useful data (4 bytes)
-                message.extend(await self.read_async(4))
-
-                # Save the payload of the message and the two final bytes (checksum)
-                message.extend(
-                    await self.read_async(
-                        (int.from_bytes(message[2:], byteorder="little") + 2)
-                    )
-                )
-                # Give the message
-                yield bytes(message)
-
-                # Set the flags
-                self.first_ublox_message_after_cleaning = False
-                self.ublox_messages = True
-
-                return
-
-            # Check if the messages are already cleaned
-            elif self.ublox_messages:
-                # Empty message
-                message = bytearray()
-
-                # Read the Preamble and discard it cause we don't need it
-                await self.read_async(2)
-
-                # Save the first useful data (4 bytes)
-                message.extend(await self.read_async(4))
-
-                # Save the payload of the message and the two final bytes (checksum)
-                message.extend(
-                    await self.read_async(
-                        (int.from_bytes(message[2:], byteorder="little") + 2)
-                    )
-                )
-                # Give the message
-                yield bytes(message)
+            # Dispatch to the reader of the current state
+            return await self.read_message[self.state]()
 
         except SerialException as error:
             # Raise exception
             raise UbloxSerialException(f"[Serial] : {error.args[0]}")
 
+    async def _read_exactly(self, number_of_bytes: int) -> bytes:
+        """
+        Read exactly the requested number of bytes out of the read
+        ahead buffer, refilling it when it runs short. A refill drains
+        everything the kernel already buffered with a single
+        synchronous read, so several frames are usually served by one
+        read call; only when the kernel buffer is empty the coroutine
+        awaits read_async for the missing bytes
+
+        :param number_of_bytes: Number of bytes to read
+        :return: The bytes read
+        """
+        buffer = self.rx_buffer
+        position = self.rx_position
+
+        # Refill the buffer until it holds the requested bytes
+        while len(buffer) - position < number_of_bytes:
+            # in_waiting is not usable on a closed port, let read_async
+            # raise the SerialException in that case
+            pending = self.in_waiting if self.is_open else 0
+            if pending:
+                # the data is already in the kernel buffer,
+                # drain it without the executor thread hop
+                buffer.extend(self.read(pending))
+            else:
+                missing = number_of_bytes - (len(buffer) - position)
+                buffer.extend(await self.read_async(missing))
+
+        # Slice the requested bytes out of the buffer
+        data = bytes(buffer[position:position + number_of_bytes])
+        self.rx_position = position + number_of_bytes
+
+        # Compact the buffer once the consumed part grows
+        if self.rx_position >= 4096:
+            del buffer[:self.rx_position]
+            self.rx_position = 0
+        return data
+
+    async def _read_cleaning_buffer(self) -> bytes:
+        """
+        Read a message while cleaning the buffer.
+        Version 8 of ublox receiver has some incorrect buffer data sent after the setup
+
+        :return: A ublox message
+        """
+        # Remove the delimeter
+        message = (await self.read_until_async(DELIMETER))[:-2]
+        len_message = len(message)
+
+        # Check if the message has an acceptable size
+        while len_message < 24:
+            message = (await self.read_until_async(DELIMETER))[:-2]
+            len_message = len(message)
+
+        # Increase the number of correct sent messages
+        self.ublox_counter += 1
+
+        # Check if we sent at least 5 correct messages
+        if self.ublox_counter == 5:
+            # Move to the next state
+            self.state = FIRST_MESSAGE
+
+        # Give the message
+        return message
+
+    async def _read_first_message(self) -> bytes:
+        """
+        Read the first message after the cleaning.
+        This message doesn't have the delimeter at the beginning cause it was cleaned with the buffer
+
+        :return: A ublox message
+        """
+        # Read the first useful data (4 bytes)
+        header = await self._read_exactly(4)
+
+        # Read the payload of the message and the two final bytes (checksum)
+        payload = await self._read_exactly(LENGTH_STRUCT.unpack_from(header, 2)[0] + 2)
+
+        # Move to the steady state
+        self.state = STEADY
+
+        # Give the message with a single concatenation
+        return header + payload
+
+    async def _read_steady_message(self) -> bytes:
+        """
+        Read a message in the steady state, the messages are already cleaned
+
+        :return: A ublox message
+        """
+        # Read the Preamble and the first useful data (4 bytes) in a single call
+        head = await self._read_exactly(6)
+
+        # Check the Preamble, a noisy line can desynchronize the stream
+        if not head.startswith(DELIMETER):
+            head = await self._resynchronize(head)
+
+        # Read the payload of the message and the two final bytes (checksum)
+        payload = await self._read_exactly(LENGTH_STRUCT.unpack_from(head, 4)[0] + 2)
+
+        # Give the message without the Preamble cause we don't need it
+        return head[2:] + payload
+
+    async def _resynchronize(self, head: bytes) -> bytes:
+        """
+        Scan the stream for the Preamble and realign to it, dropping
+        the bytes in between. bytes.find is a C level memchr-style
+        search, far cheaper than checking byte per byte in Python
+
+        :param head: The 6 bytes read in place of a well formed head
+        :return: A well formed head beginning with the Preamble
+        """
+        # Log the corruption only once per resynchronization
+        self.logger.warning("stream desynchronized, searching the preamble")
+
+        while True:
+            # Search the Preamble in the bytes read so far
+            position = head.find(DELIMETER)
+
+            if position == 0:
+                # Realigned, give the well formed head
+                return head
+
+            if position > 0:
+                # Drop the garbage before the Preamble and complete the head
+                head = head[position:] + await self._read_exactly(position)
+
+            elif head.endswith(DELIMETER[:1]):
+                # The last byte may be the first half of the Preamble
+                head = head[-1:] + await self._read_exactly(5)
+
+            else:
+                # Only garbage, read a new head
+                head = await self._read_exactly(6)
+
     async def stop_serial(self) -> None:
         """
         Method to stop the SerialReceiver
@@ -253,4 +346,4 @@ class SerialReceiver(AioSerial):
         # Shutdown  serial reader  executor
         self._read_executor.shutdown(wait=False)
         # Log
-        self.logger.info(f"disconnected from {self.port}")
+        self.logger.info("disconnected from %s", self.port)
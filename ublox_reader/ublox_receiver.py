@@ -67,8 +67,6 @@ class UbloxReceiver:
     retrieved from the serial connection
     """
 
-    # Data_to_store tuple
-    data_to_store: tuple = None
     # Connection pool to the db
     db: DataBase = None
     # Logger
@@ -88,8 +86,20 @@ class UbloxReceiver:
         self.loop = loop
         # flag to notify the reception of a time message
         self.time_flag = False
-        # queue containing the data to parse
-        self.data_to_parse = asyncio.Queue()
+        # bounded queue containing the data to parse, drained by a
+        # single worker task so frames are parsed in arrival order
+        # without allocating a task per message
+        self.data_to_parse = asyncio.Queue(maxsize=1024)
+        # tasks spawned by the receiver, tracked so the shutdown
+        # doesn't have to scan every task of the loop
+        self.tasks = set()
+        # dispatch table of the useful messages, a single dict lookup
+        # on (class, id) replaces a chain of compares per message
+        self.message_handlers = {
+            (1, 37): self._handle_time_message,
+            (1, 34): self._handle_clock_message,
+            (2, 19): self._handle_gnss_message,
+        }
 
     @staticmethod
     def run() -> None:
@@ -98,8 +108,11 @@ class UbloxReceiver:
         case of a keyboard interrupt, stop the Reader and cleanup
         gracefully
         """
-        # Get a new instance of the Event Loop
-        loop = asyncio.get_event_loop()
+        # Get a new instance of the Event Loop directly from uvloop,
+        # skipping the asyncio policy machinery
+        loop = uvloop.new_event_loop()
+        # Set as the default loop of this thread
+        asyncio.set_event_loop(loop)
 
         # OS signals to stop the receiver
         signals = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGQUIT)
@@ -112,7 +125,7 @@ class UbloxReceiver:
 
         except (DataBaseException, UbloxSerialException):
             # Something went wrong
-            loop.run_until_complete(UbloxReceiver.shut_down())
+            loop.run_until_complete(UbloxReceiver.cancel_pending_tasks())
             loop.close()
             return
 
@@ -126,7 +139,8 @@ class UbloxReceiver:
         loop.set_exception_handler(ublox_reader.handle_exception)
         try:
             # Schedule get_data and parse data
-            loop.create_task(ublox_reader.get_data())
+            ublox_reader.spawn(ublox_reader.get_data())
+            ublox_reader.spawn(ublox_reader.parse_received_data())
 
             # Get data, parse and store until a OS signal
             loop.run_forever()
@@ -156,46 +170,107 @@ class UbloxReceiver:
         # Setup made correctly, return self
         return self
 
+    def spawn(self, coro) -> asyncio.Task:
+        """
+        Schedule a coroutine keeping track of its task, so the
+        shutdown can cancel only the tasks of the receiver
+
+        :param coro: Coroutine to schedule
+        :return: The task wrapping the coroutine
+        """
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
     async def get_data(self) -> None:
         """
         Read data from serial connection until obtain a ublox message.
         Once a message is obtained, put it in the queue of the
         data to parse
         """
+        # Bind the per-frame lookups as locals, the loop runs per message
+        next_ublox_message = self.serial.next_ublox_message
+        message_handlers = self.message_handlers
+        put = self.data_to_parse.put
+
         while True:
-            async for message in self.serial.ublox_message():
+            message = await next_ublox_message()
+            # Drop the messages without a handler here, so they
+            # don't pay a queue round trip only to be discarded
+            if (message[0], message[1]) in message_handlers:
                 # Put the message in a queue to parse it
-                self.loop.create_task(self.parse_data(message))
+                await put(message)
+
+    async def parse_received_data(self) -> None:
+        """
+        Worker task that parses the messages in arrival order,
+        pulling them from the queue filled by get_data. When the
+        serial port delivers a burst, the messages already queued
+        are drained in the same loop turn, paying the scheduling
+        of the await only once per burst
+        """
+        # Bind the per-frame lookups as locals, the loop runs per message
+        get = self.data_to_parse.get
+        get_nowait = self.data_to_parse.get_nowait
+        empty = self.data_to_parse.empty
+        task_done = self.data_to_parse.task_done
+        parse_data = self.parse_data
+
+        while True:
+            await parse_data(await get())
+            # Notify the queue, the shutdown drains it with join
+            task_done()
+
+            # Drain the rest of the burst without awaiting the queue
+            while not empty():
+                await parse_data(get_nowait())
+                task_done()
 
     async def parse_data(self, data: bytes) -> None:
         """
         Parse data received from the serial connection, the data that are
-        useful are only Time messages and Galileo messages. In case of one
-        of those messages, analyze them in an executor. Parse Galileo data only if
-        a Time message was already received. Then schedule the storing of useful data in the database
+        useful are only Time messages and Galileo messages. Dispatch the
+        message to its handler with a single lookup on the class and id
+        bytes; messages without a handler are dropped
         """
-        # This is a TIME message
-        if data[0] == 1 and data[1] == 37:
-            # Set the received time message flag
-            self.time_flag = True
-            # Analyze the message in a executor
-            self.parser.parse_time_message(data)
-            return
+        handler = self.message_handlers.get((data[0], data[1]))
+        if handler is not None:
+            await handler(data)
+
+    async def _handle_time_message(self, data: bytes) -> None:
+        """
+        Handle a TIME message
+
+        :param data: The message to parse
+        """
+        # Set the received time message flag
+        self.time_flag = True
+        # Analyze the message inline, the parse is cheaper than an executor handoff
+        self.parser.parse_time_message(data)
+
+    async def _handle_clock_message(self, data: bytes) -> None:
+        """
+        Handle a CLOCK message, only after a Time message was received
 
-        # This is a CLOCK message
-        elif data[0] == 1 and data[1] == 34 and self.time_flag:
+        :param data: The message to parse
+        """
+        if self.time_flag:
             self.parser.parse_clock_message(data)
-            return
 
-        # This is a GNSS message
-        elif data[0] == 2 and self.time_flag:
-            # Check if it's a GALILEO message
-            # {GPS: 0}, {SBUS: 1}, {GALILEO: 2}, {BEIDU: 3}, {IMES: 4}, {QZSS: 5}, {GLONASS: 6}
-            if data[4] == 2:
-                # Analyze the message in a executor and scheduling the storing of the data
-                table_name, data_to_store = self.parser.parse_message(data)
-                await self.db.store_data(table_name, data_to_store)
-                # TODO: if not self.parser.attack convolution
+    async def _handle_gnss_message(self, data: bytes) -> None:
+        """
+        Handle a GNSS message, only after a Time message was received
+
+        :param data: The message to parse
+        """
+        # Check if it's a GALILEO message
+        # {GPS: 0}, {SBUS: 1}, {GALILEO: 2}, {BEIDU: 3}, {IMES: 4}, {QZSS: 5}, {GLONASS: 6}
+        if self.time_flag and data[4] == 2:
+            # Analyze the message inline and schedule the storing of the data
+            table_name, data_to_store = self.parser.parse_message(data)
+            await self.db.store_data(table_name, data_to_store)
+            # TODO: if not self.parser.attack convolution
 
     def handle_exception(self, loop, context):
         # type: (Union[asyncio.AbstractEventLoop, uvloop.Loop], Dict[str, Any]) -> None
@@ -226,6 +301,13 @@ class UbloxReceiver:
         # Log the closing of all the connections
         self.logger.warning("closing all connections")
 
+        try:
+            # Wait for the already received messages to be parsed,
+            # a deterministic drain instead of an arbitrary sleep
+            await asyncio.wait_for(self.data_to_parse.join(), timeout=5)
+        except asyncio.TimeoutError:
+            self.logger.warning("timeout draining the data to parse")
+
         # Cancel all pending tasks
         await self.shut_down()
 
@@ -241,10 +323,24 @@ class UbloxReceiver:
         # Stop the loop
         self.loop.stop()
 
+    async def shut_down(self) -> None:
+        """
+        Cancel the tasks spawned by the receiver
+        """
+        # Tracked tasks, without scanning every task of the loop
+        pending = [t for t in self.tasks if t is not asyncio.current_task()]
+
+        # Cancel all pending tasks
+        [task.cancel() for task in pending]
+
+        # Wait for all pending tasks to be cancelled
+        await asyncio.gather(*pending, return_exceptions=True)
+
     @staticmethod
-    async def shut_down() -> None:
+    async def cancel_pending_tasks() -> None:
         """
-        Cancel all pending tasks
+        Cancel all pending tasks of the loop, used only when the
+        setup fails and there is no receiver tracking its tasks
         """
         # Pending tasks
         pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
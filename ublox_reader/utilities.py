@@ -28,12 +28,13 @@ from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 import logging
+import struct
 import time
 from typing import Union, List, Dict
 
 # Third Party
-from bitarray import bitarray
 import numpy as np
 
 # settings
@@ -53,6 +54,114 @@ __docformat__ = "restructuredtext en"
 # ------------------------------------------------------------------------------
 
 
+###################
+# MESSAGE LAYOUTS #
+###################
+
+
+TIME_MESSAGE_STRUCT = struct.Struct("<I4xhB5xBB")
+"""
+Precompiled layout of the fields read from the time message starting
+from byte 8: galileo time of the week, week number, leap seconds and
+the two checksum bytes
+"""
+
+CLOCK_MESSAGE_STRUCT = struct.Struct("<ii")
+"""
+Precompiled layout of the clock bias and clock drift fields
+read from the clock message starting from byte 8
+"""
+
+AUTH_BITS_STRUCT = struct.Struct("<Q")
+"""
+Precompiled layout of the 8 bytes that contain the 40 auth bits
+"""
+
+GALILEO_WORDS_PERMUTATION = np.array(
+    [
+        3, 2, 1, 0,
+        7, 6, 5, 4,
+        11, 10, 9, 8,
+        15, 14, 13,
+        19, 18, 17, 16,
+        23, 22, 21, 20,
+        27, 26, 25, 24,
+        31, 30, 29,
+    ],
+    np.uint8,
+)
+"""
+Byte permutation that inverts the eight galileo words of the payload
+and drops the padding bytes, applied with a single C level gather
+"""
+
+
+# ------------------------------------------------------------------------------
+
+
+##################
+# TIME CONSTANTS #
+##################
+
+
+WEEK_IN_SECONDS = 604_800
+"""Seconds in a galileo week"""
+
+WEEK_IN_MS = 604_800_000
+"""Milliseconds in a galileo week"""
+
+GALILEO_EPOCH_IN_MS = 935_280_000_000
+"""Offset in milliseconds between the galileo epoch (1999-08-22) and the unix epoch"""
+
+
+# ------------------------------------------------------------------------------
+
+
+#######################
+# CONVOLUTION ENCODER #
+#######################
+
+
+def _build_convolution_tables():
+    """
+    Build the lookup tables of the rate 1/2, K=7 convolutional
+    encoder with generator polynomials 0o171 and 0o133. Everything
+    except the input bits is constant, so the two outputs and the
+    next state of every (state, input bit) pair are computed once
+    at import time; encoding a bit becomes two table lookups
+
+    :return: The output table and the next state table
+    """
+    output_table = bytearray(128)
+    state_table = bytearray(128)
+
+    for key in range(128):
+        # The key packs the 6-bit state and the input bit, the
+        # register holds the input bit followed by the state
+        register = ((key & 1) << 6) | (key >> 1)
+
+        # Every output bit is the parity of the register masked
+        # with its generator polynomial, the second one is inverted
+        out_a = bin(register & 0o171).count("1") & 1
+        out_b = bin(register & 0o133).count("1") & 1
+        output_table[key] = (out_a << 1) | (out_b ^ 1)
+
+        # The input bit enters the state, the oldest bit falls out
+        state_table[key] = ((key & 1) << 5) | (key >> 2)
+
+    return bytes(output_table), bytes(state_table)
+
+
+CONVOLUTION_OUTPUT, CONVOLUTION_STATE = _build_convolution_tables()
+"""
+Precomputed encoder tables indexed by (state << 1 | input bit):
+the two output bits packed in a pair and the next encoder state
+"""
+
+
+# ------------------------------------------------------------------------------
+
+
 ##################
 # DATA VALIDATED #
 ##################
@@ -60,6 +169,10 @@ __docformat__ = "restructuredtext en"
 
 @dataclass(eq=False)
 class Validated:
+    # the records are buffered by the hundreds, without a slotted
+    # layout every one would carry a per-instance __dict__
+    __slots__ = ("satellite_id", "data_validated")
+
     satellite_id: int
     """Satellite identifier"""
 
@@ -84,9 +197,16 @@ class DataParser:
     # Where the serial receiver is physically connected
     nation: str = config.get("COUNTRY", "NATION")
 
+    # Table names already formatted, one per satellite identifier
+    table_names: Dict[int, str] = {}
+    table_names_year: int = None
+
     # Time constants
-    year: int = None
-    reception_time: float = None
+    year: int = datetime.now().year
+    # number of time messages between two refreshes of the cached year
+    year_refresh_period: int = 3600
+    _year_countdown: int = 0
+    reception_time: int = None
     timestamp_message_unix: float = None
     timestamp_message_galileo: int = None
     first_timestamp_galileo: int = None
@@ -109,7 +229,9 @@ class DataParser:
     # Validation
     file_path: str = config.get("VALIDATION", "PATH")
     validation_active: bool = config.getboolean("VALIDATION", "ACTIVE")
-    offset: int = 0
+    # persistent handle of the validation file, opened once with the
+    # header instead of reopening the file at every flush
+    validation_file = None
     if validation_active:
         executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=3)
         valid_data_to_store: Dict[int, List[Validated]] = defaultdict(list)
@@ -123,36 +245,54 @@ class DataParser:
 
         :param data: Bytes to parse
         """
-        # Save the time of the message reception
-        self.year = datetime.now().year
-        self.reception_time = time.time() * 1000  # expressed in ms
-
-        # Read RAW data from the message
-        self.raw_gal_tow = int.from_bytes(data[8:12], byteorder="little")
-        self.raw_gal_wno = int.from_bytes(data[16:18], byteorder="little", signed=True)
-        self.raw_leap_s = data[18]
-        self.time_raw_ck_a = data[24]
-        self.time_raw_ck_b = data[25]
-
-        # Compute time using all the data read from raw data
+        # Refresh the cached year lazily, the time messages arrive
+        # once per second so a syscall every message is wasted work
+        if self._year_countdown == 0:
+            self.year = datetime.now().year
+            self._year_countdown = self.year_refresh_period
+        self._year_countdown -= 1
+
+        # Save the time of the message reception as an integer, so it
+        # matches the bigint column in the binary COPY to the database
+        self.reception_time = int(time.time() * 1000)  # expressed in ms
+
+        # Read RAW data from the message in a single unpack
+        (
+            self.raw_gal_tow,
+            self.raw_gal_wno,
+            self.raw_leap_s,
+            self.time_raw_ck_a,
+            self.time_raw_ck_b,
+        ) = TIME_MESSAGE_STRUCT.unpack_from(data, 8)
+
+        # Compute time using all the data read from raw data, the
+        # expression is flattened so the week number is multiplied
+        # once by a precomputed constant instead of twice
         self.timestamp_message_unix = DataParser.adjust_second(
-            ((self.raw_gal_wno * 604800 + self.raw_gal_tow) * 1000 + 935280000000)
-            - (self.raw_leap_s * 1000)
+            self.raw_gal_wno * WEEK_IN_MS
+            + self.raw_gal_tow * 1000
+            + GALILEO_EPOCH_IN_MS
+            - self.raw_leap_s * 1000
         )  # (expressed in ms)
 
         self.timestamp_message_galileo = DataParser.adjust_second(
-            (self.raw_gal_wno * 604800 + self.raw_gal_tow)
+            self.raw_gal_wno * WEEK_IN_SECONDS + self.raw_gal_tow
         )
         if not self.first_timestamp_galileo and self.validation_active:
             self.first_timestamp_galileo = self.timestamp_message_galileo
-            with open(self.file_path, "w") as fp:
-                fp.write("# FILE_VERSION = 1\n")
-                fp.write("# NAV_TYPE = GAL_E1_INAV\n")
-                fp.write("# BIT_TYPE = MESSAGE_SYMBOLS\n")
-                fp.write("# FRAME_LENGTH_BITS = 250\n")
-                fp.write("# FRAME_LENGTH_TIME = 1\n")
-                fp.write("# BIT_ORDER = MSB_FIRST\n")
-                fp.write(f"# START_TIME_TAG = {self.first_timestamp_galileo}\n")
+            # open the validation file once, the handle is kept for
+            # every following flush of validated data
+            self.validation_file = open(self.file_path, "w")
+            self.validation_file.write(
+                "# FILE_VERSION = 1\n"
+                "# NAV_TYPE = GAL_E1_INAV\n"
+                "# BIT_TYPE = MESSAGE_SYMBOLS\n"
+                "# FRAME_LENGTH_BITS = 250\n"
+                "# FRAME_LENGTH_TIME = 1\n"
+                "# BIT_ORDER = MSB_FIRST\n"
+                f"# START_TIME_TAG = {self.first_timestamp_galileo}\n"
+            )
+            self.validation_file.flush()
 
     def parse_clock_message(self, data: bytes) -> None:
         """
@@ -162,17 +302,20 @@ class DataParser:
         :return:
         """
 
-        # Check if we already received a message
-        if self.bias and self.drift:
-            current_drift = int.from_bytes(data[12:16], byteorder="little", signed=True)
-            current_bias = int.from_bytes(data[8:12], byteorder="little", signed=True)
+        # Check if we already received a message, testing against the
+        # sentinel: a legitimate bias or drift of zero is a valid sample
+        # and must not be mistaken for the first message forever
+        if self.bias is not None:
+            current_bias, current_drift = CLOCK_MESSAGE_STRUCT.unpack_from(data, 8)
 
-            # Attack attack false condition
+            # Attack attack false condition, the bias delta is
+            # computed once and compared against both windows
+            bias_delta = abs(current_bias - self.bias)
             if current_drift < self.threshold and (
-                abs(current_bias - self.bias) < self.threshold
+                bias_delta < self.threshold
                 or (
                     (1_000_000 - self.threshold)
-                    < abs(current_bias - self.bias)
+                    < bias_delta
                     < 1_000_000 + self.threshold
                 )
             ):
@@ -187,13 +330,14 @@ class DataParser:
 
         else:
             # first clock message received
-            self.bias = int.from_bytes(data[8:12], byteorder="little", signed=True)
-            self.drift = int.from_bytes(data[12:16], byteorder="little", signed=True)
+            self.bias, self.drift = CLOCK_MESSAGE_STRUCT.unpack_from(data, 8)
 
     @staticmethod
-    def adjust_second(seconds: Union[float, int]) -> Union[float, int]:
+    def adjust_second(seconds: int) -> int:
         """
-        Utility method to adjust reception time
+        Utility method to adjust reception time.
+        The whole timestamp pipeline is integer milliseconds,
+        so test the parity with a single AND instead of a modulo
 
         :param seconds: Time of the received message
         :return: Correct reception time
@@ -202,10 +346,8 @@ class DataParser:
         #  (reception time is more than the real time). Messages are retrived each seconds,
         #  but ublox send message every second, divided at odd or even seconds.
         #  --> ask to GIANLUCA
-        if seconds % 2 == 0:
-            return seconds - 3
-        else:
-            return seconds - 2
+        # branchless: -2 for an odd second, -3 for an even one
+        return seconds - 3 + (seconds & 1)
 
     def parse_message(self, data: bytes) -> Union[str, tuple]:
         """
@@ -218,36 +360,34 @@ class DataParser:
         :return: Table name and the tuple of data to store
         """
 
+        # Bind the attributes read more than once as locals
+        year = self.year
+        timestamp_message_galileo = self.timestamp_message_galileo
+
         # Read all data
         raw_sv_id = data[5]
-        # auth bit are encoded in 8 bytes from byte 28 to byte 36
-        raw_auth_bits = DataParser.read_auth_bits(data[28:36])
+        # auth bit are encoded in 8 bytes from byte 28 to byte 36,
+        # read them in place without slicing them out of the frame
+        raw_auth_bits = DataParser.read_auth_bits(data, 28)
         raw_num_words = data[8]
         raw_ck_a = data[-2]
         raw_ck_b = data[-1]
-        # Galileo Data are encoded from byte 12 to byte 44
-        galileo_data = DataParser.extract_galileo_data(data[12:44])
+        # Galileo Data are encoded from byte 12 to byte 44, keep the
+        # raw bytes for the validation and hex them once for the row
+        galileo_data_in_bytes = DataParser._extract_galileo_bytes(data[12:44])
+        galileo_data = galileo_data_in_bytes.hex()
 
         # Check if the validation is active
         if self.validation_active:
-            galileo_data_in_bytes = bytes.fromhex(galileo_data)
-
             # Convert the timestamp in seconds
-            offset = self.timestamp_message_galileo - self.first_timestamp_galileo
+            offset = timestamp_message_galileo - self.first_timestamp_galileo
 
-            # Schedule the validation of the first half of the data
+            # Schedule the validation of both halves of the data with
+            # a single task and a single executor submission
             asyncio.create_task(
                 self.validate_data(
                     offset,
-                    galileo_data_in_bytes[:15],
-                    raw_sv_id,
-                )
-            )
-
-            asyncio.create_task(
-                self.validate_data(
-                    offset + 1,
-                    galileo_data_in_bytes[15:],
+                    galileo_data_in_bytes,
                     raw_sv_id,
                 )
             )
@@ -267,8 +407,17 @@ class DataParser:
         #  const reserved2 = data[11]
         #  const size = int.from_bytes(data[2:4], byteorder="little")
 
+        # Format the table name only the first time a satellite is seen
+        if self.table_names_year != year:
+            self.table_names = {}
+            self.table_names_year = year
+        table = self.table_names.get(raw_sv_id)
+        if table is None:
+            table = f"{year}_{self.nation}_{raw_sv_id}"
+            self.table_names[raw_sv_id] = table
+
         # Return the table name and the tuple of data to store
-        return f"{self.year}_{self.nation}_{raw_sv_id}", (
+        return table, (
             self.reception_time,
             self.timestamp_message_unix,
             self.raw_gal_tow,
@@ -284,28 +433,36 @@ class DataParser:
             self.time_raw_ck_a,
             self.time_raw_ck_b,
             authenticity,
-            self.timestamp_message_galileo,
+            timestamp_message_galileo,
         )
 
     @staticmethod
-    def read_auth_bits(data: bytes) -> int:
+    def read_auth_bits(data: bytes, offset: int = 0) -> int:
         """
         Utility method to retrieve only auth bits from the entire data string
 
-        :param data: The 8 bytes to analise
+        :param data: Buffer containing the 8 bytes to analise
+        :param offset: Position of the 8 bytes inside the buffer
         :return: An integer which represents the 40 auth bits
         """
-        # Initialize the array
-        auth_bits = bitarray(endian="little")
+        # Read the 64 bits as a single little endian integer
+        value = AUTH_BITS_STRUCT.unpack_from(data, offset)[0]
 
-        # get the 64 bits
-        auth_bits.frombytes(data)
+        # isolate the 40 auth bits dropping bits 14 to 37:
+        # keep the low 14 bits and append the high 26 bits after them
+        return (value & 0x3FFF) | ((value >> 38) << 14)
 
-        # isolate the 40 auth bits
-        del auth_bits[14:38]
+    @staticmethod
+    def _extract_galileo_bytes(data: bytes) -> bytes:
+        """
+        Utility method to extract galileo data from ublox message
 
-        # return the value of those 40 bits as an integer
-        return int.from_bytes(auth_bits.tobytes(), byteorder="little")
+        :param data: payload
+        :return: the 30 bytes of galileo data
+        """
+        # Invert the words and remove the padding with a single
+        # gather instead of eight reversed slices and their concatenation
+        return bytes(np.frombuffer(data, np.uint8)[GALILEO_WORDS_PERMUTATION])
 
     @staticmethod
     def extract_galileo_data(data: bytes) -> str:
@@ -315,27 +472,16 @@ class DataParser:
         :param data: payload
         :return: bytes in hex format
         """
-        # Invert the data and remove the padding
-        wordA = data[3::-1]
-        wordB = data[7:3:-1]
-        wordC = data[11:7:-1]
-        wordD = data[15:12:-1]  # padding removed
-        wordE = data[19:15:-1]
-        wordF = data[23:19:-1]
-        wordG = data[27:23:-1]
-        wordH = data[31:28:-1]  # padding removed
-
-        # generate the galileo data
-        galileo_data = wordA + wordB + wordC + wordD + wordE + wordF + wordG + wordH
-
-        return galileo_data.hex()
+        return DataParser._extract_galileo_bytes(data).hex()
 
     async def validate_data(self, offset: int, data: bytes, satellite_id: int):
         """
-        Validate data and store them internally
+        Validate both halves of the data and store them internally.
+        The halves are convolved back to back in one executor job,
+        paying the task and executor round trip once per message
 
-        :param offset: message offset
-        :param data: data to validate
+        :param offset: message offset of the first half
+        :param data: the 30 bytes of data to validate
         :param satellite_id: Identifier of the satellite
         """
 
@@ -343,8 +489,20 @@ class DataParser:
         loop = asyncio.get_running_loop()
 
         # Validate the data and store them
-        validated = await loop.run_in_executor(self.executor, self.convolution, data)
-        await self._store_internally_data(offset, validated, satellite_id)
+        first_half, second_half = await loop.run_in_executor(
+            self.executor, self._convolve_halves, data
+        )
+        await self._store_internally_data(offset, first_half, satellite_id)
+        await self._store_internally_data(offset + 1, second_half, satellite_id)
+
+    def _convolve_halves(self, data: bytes):
+        """
+        Convolve both halves of the data, runs in the executor thread
+
+        :param data: the 30 bytes of data to validate
+        :return: Both halves convolved
+        """
+        return self.convolution(data[:15]), self.convolution(data[15:])
 
     async def _store_internally_data(
         self, timestamp: int, data: str, satellite_id: int
@@ -359,20 +517,14 @@ class DataParser:
         # Check if we have enough elements stored in memory
         if len(self.valid_data_to_store) == 30:
 
-            # Store offset value
-            old_offset = self.offset
-            self.offset += 20
-
-            # Data to store
+            # Pop the 20 oldest timestamps relying on the insertion
+            # order of the dict, instead of guessing their range from
+            # a running offset and probing keys that may not exist
             store = {
-                key: self.valid_data_to_store[key]
-                for key in range(old_offset, self.offset)
+                key: self.valid_data_to_store.pop(key)
+                for key in list(islice(self.valid_data_to_store, 20))
             }
 
-            # Clean the internal storage
-            for key in range(old_offset, self.offset):
-                del self.valid_data_to_store[key]
-
             # store data in a file
             loop = asyncio.get_running_loop()
             await loop.run_in_executor(
@@ -384,10 +536,18 @@ class DataParser:
         Store validated data in a file
         :return:
         """
-        with open(self.file_path, "a") as fp:
-            for offset in data_to_store:
-                for data in data_to_store[offset]:
-                    fp.write(f"{offset},{data.satellite_id},{data.data_validated}\n")
+        # Join the rows in memory and write them with a single call
+        # on the persistent handle, no open/close syscalls per flush
+        lines = [
+            f"{offset},{data.satellite_id},{data.data_validated}\n"
+            for offset, data_list in data_to_store.items()
+            for data in data_list
+        ]
+        if self.validation_file is None:
+            # the header was never written, append to the file
+            self.validation_file = open(self.file_path, "a")
+        self.validation_file.write("".join(lines))
+        self.validation_file.flush()
 
     @staticmethod
     def convolution(data: bytes) -> str:
@@ -396,55 +556,35 @@ class DataParser:
         :param data: input data
         :return: data convolved in hex format
         """
-        convert_data_in_bits = bitarray()
-        convert_data_in_bits.frombytes(data)
-
-        g = np.array([[1, 1, 1, 1, 0, 0, 1], [1, 0, 1, 1, 0, 1, 1]], bool)
-
-        n, K = g.shape
-        m = K - 1
-
-        state = np.zeros(6, bool)
-
-        inputx: np.array = np.array(convert_data_in_bits.tolist(), bool)
-        h = inputx.shape[0]
-
-        outputy = np.zeros(240, bool)
-        output = np.zeros(2, bool)
-
-        for x in range(h):
-            input_data = inputx[x]
-
-            for i in range(n):
-                output[i] = g[i][0] * input_data
-                for j in range(1, K):
-                    output[i] = np.logical_xor(output[i], g[i, j] * state[j - 1])
-
-            state[1:] = state[: m - 1]
-            state[0] = input_data
-
-            output[1] = np.logical_not(output[1])
-            outputy[x * 2] = output[0]
-            outputy[(x * 2) + 1] = output[1]
-
-        n_col = 30
-        n_row = 8
-
-        interleaver = np.zeros((n_row, n_col), bool)
-
-        for col in range(n_col):
-            interleaver[:, col] = outputy[col * n_row : (col * n_row) + n_row]
-
-        interleaved = np.zeros(256, bool)
-        sinc = np.array([0, 1, 0, 1, 1, 0, 0, 0, 0, 0], bool)
+        # Unpack the input bits with a single C call, the list is
+        # for the loop: iterating plain ints is cheaper than numpy scalars
+        convert_data_in_bits = np.unpackbits(np.frombuffer(data, np.uint8)).tolist()
+
+        # Encode with the precomputed tables, a bit costs two
+        # lookups instead of a chain of XOR calls
+        state = 0
+        position = 0
+        outputy = np.zeros(240, np.uint8)
+
+        for input_data in convert_data_in_bits:
+            key = (state << 1) | input_data
+            pair = CONVOLUTION_OUTPUT[key]
+            outputy[position] = pair >> 1
+            outputy[position + 1] = pair & 1
+            position += 2
+            state = CONVOLUTION_STATE[key]
+
+        interleaved = np.zeros(256, np.uint8)
+        sinc = np.array([0, 1, 0, 1, 1, 0, 0, 0, 0, 0], np.uint8)
         interleaved[:10] = sinc[:]
 
-        for row in range(n_row):
-            interleaved[10 + (row * n_col) : 10 + (row * n_col) + n_col] = interleaver[
-                row, :
-            ]
+        # Write the bits by column in a 8x30 matrix and read them back
+        # by row: a reshape, a transpose and one contiguous copy instead
+        # of 38 Python level slice assignments
+        interleaved[10:250] = outputy.reshape(30, 8).T.ravel()
 
-        return bitarray(interleaved.tolist()).tobytes().hex()
+        # Pack the bits with a single C call
+        return np.packbits(interleaved).tobytes().hex()
 
 
 # ------------------------------------------------------------------------------